@@ -4,15 +4,14 @@
 # LICENSE file in the root directory of this source tree.
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 import logging
-import numpy as np
 
+import torch
 import torch.nn.functional as F
 
-from fairseq import utils
 from fairseq.criterions import register_criterion
 from fairseq.criterions.cross_entropy import CrossEntropyCriterion, CrossEntropyCriterionConfig
-from fairseq.data import data_utils
 
 
 logger = logging.getLogger(__name__)
@@ -35,9 +34,16 @@ class CrossEntropyV2Criterion(CrossEntropyCriterion):
         super().__init__(task, sentence_avg)
 
         self.dictionary = task.target_dictionary
+        # wordpiece_decode is a pure function of its input string, so its
+        # results can be memoized across training printouts
+        self._wordpiece_decode = lru_cache(maxsize=4096)(self.dictionary.wordpiece_decode)
         self.print_interval = print_training_sample_interval
         self.epoch = 1
         self.prev_num_updates = -1
+        self._next_print = print_training_sample_interval
+        # seeded per print step for reproducible sample selection without
+        # touching numpy's global RNG state
+        self._rng = torch.Generator()
 
     def forward(self, model, sample, reduce=True):
         """Compute the loss for the given sample; periodically print out
@@ -49,7 +55,7 @@ class CrossEntropyV2Criterion(CrossEntropyCriterion):
         3) logging outputs to display while training
         """
         net_output = model(**sample["net_input"], epoch=self.epoch)
-        loss, _, lprobs = self.compute_loss(model, net_output, sample, reduce=reduce)
+        loss, _, _ = self.compute_loss(model, net_output, sample, reduce=reduce)
         sample_size = (
             sample["target"].size(0) if self.sentence_avg else sample["ntokens"]
         )
@@ -60,29 +66,65 @@ class CrossEntropyV2Criterion(CrossEntropyCriterion):
             "sample_size": sample_size,
         }
 
+        num_updates = getattr(model, "num_updates", 0)
         if (
-            hasattr(model, "num_updates") and model.training and
-            model.num_updates // self.print_interval >
-            (model.num_updates - 1) // self.print_interval and
-            model.num_updates != self.prev_num_updates
+            model.training and num_updates >= self._next_print and
+            num_updates != self.prev_num_updates
         ):  # print a randomly sampled result every print_interval updates
-            self.prev_num_updates = model.num_updates
+            self.prev_num_updates = num_updates
+            self._next_print = num_updates + self.print_interval
             target = model.get_targets(sample, net_output)
-            pred = lprobs.argmax(-1).cpu()  # bsz x len
-            assert pred.size() == target.size()
-            with data_utils.numpy_seed(model.num_updates):
-                i = np.random.randint(0, len(sample["id"]))
-            length = utils.strip_pad(target.data[i], self.padding_idx).size(0)
+            self._rng.manual_seed(num_updates)
+            i = int(torch.randint(len(sample["id"]), (1,), generator=self._rng).item())
+            logits = self._extract_logits(model, net_output)  # B x T x V
+            if logits is not None:
+                # argmax is invariant under log_softmax, so take it on the raw
+                # logits, and only for the sampled sentence
+                pred_i = logits[i].argmax(-1).cpu()  # len
+            else:
+                lprobs = model.get_normalized_probs(net_output, log_probs=True)  # B x T x V
+                pred_i = lprobs[i].argmax(-1).cpu()  # len
+            assert pred_i.size(0) == target.size(1)
+            # count non-pad tokens directly instead of materializing the
+            # stripped target with a masked_select
+            length = int((target[i] != self.padding_idx).sum().item())
             ref_one = sample["text"][i]
-            pred_one = self.dictionary.wordpiece_decode(self.dictionary.string(pred.data[i][:length]))
+            pred_one = self._wordpiece_decode(self.dictionary.string(pred_i[:length]))
             logger.info("sample REF: " + ref_one)
             logger.info("sample PRD: " + pred_one)
 
         return loss, sample_size, logging_output
 
+    def _extract_logits(self, model, net_output):
+        """Return batch-first (B x T x V) logits from *net_output*, or None if
+        raw vocab logits are unavailable (e.g. with adaptive softmax)."""
+        if isinstance(net_output, dict):
+            encoder_out = net_output["encoder_out"]
+            if len(encoder_out) > 0 and torch.is_tensor(encoder_out[0]):
+                return encoder_out[0].transpose(0, 1)  # T x B x V -> B x T x V
+            return None
+        logits = net_output[0] if isinstance(net_output, (list, tuple)) else net_output
+        if (
+            torch.is_tensor(logits)
+            and getattr(getattr(model, "decoder", None), "adaptive_softmax", None) is None
+        ):
+            return logits  # B x T x V
+        return None
+
     def compute_loss(self, model, net_output, sample, reduce=True):
-        lprobs = model.get_normalized_probs(net_output, log_probs=True)
         target = model.get_targets(sample, net_output)
+        logits = self._extract_logits(model, net_output)
+        if logits is not None:
+            # fast path: fuse log_softmax + NLL in a single kernel, avoiding a
+            # full pass over the vocab dimension to materialize lprobs
+            loss = F.cross_entropy(
+                logits.reshape(-1, logits.size(-1)).float(),
+                target.view(-1),
+                ignore_index=self.padding_idx,
+                reduction="sum" if reduce else "none",
+            )
+            return loss, loss, None
+        lprobs = model.get_normalized_probs(net_output, log_probs=True)
         loss = F.nll_loss(
             lprobs.view(-1, lprobs.size(-1)),
             target.view(-1),
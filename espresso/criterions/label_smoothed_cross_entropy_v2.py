@@ -173,13 +173,15 @@ class LabelSmoothedCrossEntropyV2Criterion(LabelSmoothedCrossEntropyCriterion):
         ):  # print a randomly sampled result every print_interval updates
             self.prev_num_updates = model.num_updates
             target = model.get_targets(sample, net_output)
-            pred = lprobs.view(target.size(0), -1, lprobs.size(-1)).argmax(-1).cpu()  # bsz x len
-            assert pred.size() == target.size()
             with data_utils.numpy_seed(model.num_updates):
                 i = np.random.randint(0, len(sample["id"]))
+            # only the sampled sentence is printed, so only its argmax needs
+            # to be computed and transferred to CPU
+            pred_i = lprobs.view(target.size(0), -1, lprobs.size(-1))[i].argmax(-1).cpu()  # len
+            assert pred_i.size(0) == target.size(1)
             length = utils.strip_pad(target.data[i], self.padding_idx).size(0)
             ref_one = sample["text"][i]
-            pred_one = self.dictionary.wordpiece_decode(self.dictionary.string(pred.data[i][:length]))
+            pred_one = self.dictionary.wordpiece_decode(self.dictionary.string(pred_i[:length]))
             logger.info("sample REF: " + ref_one)
             logger.info("sample PRD: " + pred_one)
 
@@ -205,7 +205,7 @@ class LatticeFreeMMICriterion(FairseqCriterion):
             )
             encoder_out_squared = encoder_out.pow(2.0)
             if encoder_padding_mask is not None:
-                pad_mask = encoder_padding_mask.transpose(0, 1).unsqueeze(-1)  # T x B -> B x T x 1
+                pad_mask = encoder_padding_mask.unsqueeze(-1)  # B x T -> B x T x 1
                 encoder_out_squared.masked_fill_(pad_mask, 0.0)
             loss += 0.5 * self.output_l2_regularize * encoder_out_squared.sum()
 
@@ -29,8 +29,9 @@ class SubsampledCrossEntropyWithAccuracyCriterion(CrossEntropyCriterion):
         super().__init__(task, sentence_avg)
         self.subsampling_factor = None
         # indicate whether to transpose the first two dimensions of net_output
-        # so that it is B x T x V
-        self.transpose_net_output = getattr(task, "transpose_net_output", True)
+        # so that it is B x T x V; the hybrid encoder models already return
+        # batch-first probs from get_normalized_probs
+        self.transpose_net_output = getattr(task, "transpose_net_output", False)
         self.state_prior_update_interval = getattr(task, "state_prior_update_interval", None)
 
     def forward(self, model, sample, reduce=True):
@@ -300,8 +300,10 @@ class ConvBNReLU(nn.Module):
                     self.kernel_sizes[i], self.strides[i]))
             self.batchnorms.append(nn.BatchNorm2d(out_channels[i]))
 
-    def output_lengths(self, in_lengths):
-        out_lengths = in_lengths
+        # cumulative stride along the time dimension; iterated ceil-division
+        # by the per-layer strides equals a single ceil-division by their
+        # product, so output_lengths reduces to one vectorized op
+        self.total_stride = 1
         for stride in self.strides:
             if isinstance(stride, (list, tuple)):
                 assert len(stride) > 0
@@ -309,8 +311,10 @@ class ConvBNReLU(nn.Module):
             else:
                 assert isinstance(stride, int)
                 s = stride
-            out_lengths = (out_lengths + s - 1) // s
-        return out_lengths
+            self.total_stride *= s
+
+    def output_lengths(self, in_lengths):
+        return (in_lengths + self.total_stride - 1) // self.total_stride
 
     def forward(self, src, src_lengths):
         # B X T X C -> B X (input channel num) x T X (C / input channel num)
@@ -5,7 +5,7 @@
 
 from argparse import Namespace
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 import torch
 from torch import Tensor
@@ -123,9 +123,10 @@ class SpeechLSTMEncoderModel(FairseqEncoderModel):
 
     def get_normalized_probs(self, net_output, log_probs, sample=None):
         """Get normalized probabilities (or log probs) from a net's output."""
-        encoder_out = net_output.encoder_out
+        encoder_out = net_output["encoder_out"][0]
         if torch.is_tensor(encoder_out):
-            logits = encoder_out.float()
+            # T x B x V -> B x T x V so that probs align with batch-first targets
+            logits = encoder_out.transpose(0, 1).contiguous().float()
             if log_probs:
                 return F.log_softmax(logits, dim=-1)
             else:
@@ -238,7 +239,7 @@ class SpeechChunkLSTMEncoder(SpeechLSTMEncoder):
                 required. Default: True.
         """
         out = super().forward(src_tokens, src_lengths, enforce_sorted=enforce_sorted, **unused)
-        x, encoder_padding_mask, x_lengths = out.encoder_out, out.encoder_padding_mask, out.src_lengths
+        x, x_lengths = out["encoder_out"][0], out["src_lengths"][0]
 
         # determine which output frame to select for loss evaluation/test, assuming
         # all examples in a batch are of the same length for chunk-wise training/test
@@ -248,7 +249,7 @@ class SpeechChunkLSTMEncoder(SpeechLSTMEncoder):
         ):
             x = x[self.out_chunk_begin: self.out_chunk_end]  # T x B x C -> W x B x C
             x_lengths = x_lengths.fill_(x.size(0))
-            assert encoder_padding_mask is None
+            assert len(out["encoder_padding_mask"]) == 0
 
         if self.fc_out is not None:
             x = self.fc_out(x)  # T x B x C -> T x B x V
@@ -259,14 +260,40 @@ class SpeechChunkLSTMEncoder(SpeechLSTMEncoder):
         # The empty list is equivalent to None.
         return {
             "encoder_out": [x],  # T x B x C
-            "encoder_padding_mask": [encoder_padding_mask] if encoder_padding_mask.any()
-            else [],  # T x B
+            "encoder_padding_mask": [out["encoder_padding_mask"][0].t()]
+            if len(out["encoder_padding_mask"]) > 0
+            else [],  # B x T
             "encoder_embedding": [],
             "encoder_states": [],
             "src_tokens": [],
             "src_lengths": [x_lengths],  # B
         }
 
+    def reorder_encoder_out(self, encoder_out: Dict[str, List[Tensor]], new_order):
+        if len(encoder_out["encoder_out"]) == 0:
+            new_encoder_out = []
+        else:
+            new_encoder_out = [encoder_out["encoder_out"][0].index_select(1, new_order)]
+        if len(encoder_out["encoder_padding_mask"]) == 0:
+            new_encoder_padding_mask = []
+        else:
+            new_encoder_padding_mask = [
+                encoder_out["encoder_padding_mask"][0].index_select(0, new_order)
+            ]
+        if len(encoder_out["src_lengths"]) == 0:
+            new_src_lengths = []
+        else:
+            new_src_lengths = [(encoder_out["src_lengths"][0]).index_select(0, new_order)]
+
+        return {
+            "encoder_out": new_encoder_out,  # T x B x C
+            "encoder_padding_mask": new_encoder_padding_mask,  # B x T
+            "encoder_embedding": [],
+            "encoder_states": [],
+            "src_tokens": [],
+            "src_lengths": new_src_lengths,  # B x 1
+        }
+
 
 @register_model_architecture("speech_lstm_encoder_model", "speech_lstm_encoder_model")
 def base_architecture(args):
@@ -102,9 +102,10 @@ class SpeechTdnnEncoderModel(FairseqEncoderModel):
 
     def get_normalized_probs(self, net_output, log_probs, sample=None):
         """Get normalized probabilities (or log probs) from a net's output."""
-        encoder_out = net_output.encoder_out
+        encoder_out = net_output["encoder_out"][0]
         if torch.is_tensor(encoder_out):
-            logits = encoder_out.float()
+            # T x B x V -> B x T x V so that probs align with batch-first targets
+            logits = encoder_out.transpose(0, 1).contiguous().float()
             if log_probs:
                 return F.log_softmax(logits, dim=-1)
             else:
@@ -112,7 +113,7 @@ class SpeechTdnnEncoderModel(FairseqEncoderModel):
         raise NotImplementedError
 
     def get_logits(self, net_output):
-        logits = net_output.encoder_out.transpose(0, 1).squeeze(2)  # T x B x 1 -> B x T
+        logits = net_output["encoder_out"][0].transpose(0, 1).squeeze(2)  # T x B x 1 -> B x T
         return logits
 
     def update_state_prior(self, new_state_prior, factor=0.1):
@@ -265,7 +266,7 @@ class SpeechTdnnEncoder(FairseqEncoder):
         return {
             "encoder_out": [x],  # T x B x C
             "encoder_padding_mask": [encoder_padding_mask] if encoder_padding_mask.any()
-            else [],  # T x B
+            else [],  # B x T
             "encoder_embedding": [],
             "encoder_states": [],
             "src_tokens": [],
@@ -285,9 +286,8 @@ class SpeechTdnnEncoder(FairseqEncoder):
             x = x + prev_x if self.residual and i > 0 and x.size(1) == prev_x.size(1) else x
 
         x = x.transpose(0, 1)  # B x T x C -> T x B x C
-        encoder_padding_mask = padding_mask.t()
 
-        return x, x_lengths, encoder_padding_mask
+        return x, x_lengths, padding_mask  # padding_mask: B x T
 
     def output_layer(self, features, **kwargs):
         """Project features to the vocabulary size."""
@@ -302,7 +302,7 @@ class SpeechTdnnEncoder(FairseqEncoder):
             new_encoder_padding_mask = []
         else:
             new_encoder_padding_mask = [
-                encoder_out["encoder_padding_mask"][0].index_select(1, new_order)  # note: transposed
+                encoder_out["encoder_padding_mask"][0].index_select(0, new_order)
             ]
         if len(encoder_out["src_lengths"]) == 0:
             new_src_lengths = []
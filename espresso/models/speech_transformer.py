@@ -468,7 +468,7 @@ class SpeechTransformerEncoder(TransformerEncoder):
             "encoder_embedding": [],
             "encoder_states": encoder_states,  # List[T x B x C]
             "src_tokens": [],
-            "src_lengths": [],
+            "src_lengths": [src_lengths],  # B
         }
 
     def max_positions(self):
@@ -135,14 +135,19 @@ class SpeechTransformerEncoderModel(FairseqEncoderModel):
 
         transformer_encoder_input_size = task.feat_dim // task.feat_in_channels
         if conv_layers is not None:
+            # iterated ceil-division by the per-layer frequency strides equals
+            # a single ceil-division by their product
+            freq_stride = 1
             for stride in strides:
                 if isinstance(stride, (list, tuple)):
                     assert len(stride) > 0
-                    s = stride[1] if len(stride) > 1 else stride[0]
+                    freq_stride *= stride[1] if len(stride) > 1 else stride[0]
                 else:
                     assert isinstance(stride, int)
-                    s = stride
-                transformer_encoder_input_size = (transformer_encoder_input_size + s - 1) // s
+                    freq_stride *= stride
+            transformer_encoder_input_size = (
+                transformer_encoder_input_size + freq_stride - 1
+            ) // freq_stride
             transformer_encoder_input_size *= out_channels[-1]
         else:
             transformer_encoder_input_size = task.feat_dim
@@ -171,8 +176,11 @@ class SpeechTransformerEncoderModel(FairseqEncoderModel):
             chunk_left_context=getattr(task, "chunk_left_context", 0),
             training_stage=getattr(task, "training_stage", True),
         )
+        min_params_to_wrap = getattr(
+            args, "min_params_to_wrap", DEFAULT_MIN_PARAMS_TO_WRAP
+        )
         # fsdp_wrap is a no-op when --ddp-backend != fully_sharded
-        encoder = fsdp_wrap(encoder, min_num_params=1e8)
+        encoder = fsdp_wrap(encoder, min_num_params=min_params_to_wrap)
         return cls(args, encoder, state_prior=getattr(task, "initial_state_prior", None))
 
     def set_num_updates(self, num_updates):
@@ -200,9 +208,10 @@ class SpeechTransformerEncoderModel(FairseqEncoderModel):
 
     def get_normalized_probs(self, net_output, log_probs, sample=None):
         """Get normalized probabilities (or log probs) from a net's output."""
-        encoder_out = net_output.encoder_out
+        encoder_out = net_output["encoder_out"][0]
         if torch.is_tensor(encoder_out):
-            logits = encoder_out.float()
+            # T x B x V -> B x T x V so that probs align with batch-first targets
+            logits = encoder_out.transpose(0, 1).contiguous().float()
             if log_probs:
                 return F.log_softmax(logits, dim=-1)
             else:
@@ -211,9 +220,11 @@ class SpeechTransformerEncoderModel(FairseqEncoderModel):
 
     def update_state_prior(self, new_state_prior, factor=0.1):
         assert self.state_prior is not None
-        self.state_prior = self.state_prior.to(new_state_prior)
-        self.state_prior = (1. - factor) * self.state_prior + factor * new_state_prior
-        self.state_prior = self.state_prior / self.state_prior.sum()  # re-normalize
+        state_prior = self.state_prior.to(new_state_prior)
+        # in-place EMA update + re-normalization to avoid intermediate tensors
+        state_prior.mul_(1. - factor).add_(new_state_prior, alpha=factor)
+        state_prior.div_(state_prior.sum())
+        self.state_prior = state_prior
 
     def state_dict(self):
         state_dict = super().state_dict()
@@ -272,6 +283,11 @@ class SpeechChunkTransformerEncoder(SpeechTransformerEncoder):
             else None
         )
 
+        if hasattr(torch, "compile"):
+            # on PyTorch 2.x let the compiler fuse the slice/fill/projection
+            # tail of forward into fewer kernel launches
+            self._postprocess = torch.compile(self._postprocess, dynamic=True)
+
     def forward(
         self,
         src_tokens,
@@ -300,8 +316,22 @@ class SpeechChunkTransformerEncoder(SpeechTransformerEncoder):
                   Only populated if *return_all_hiddens* is True.
         """
         out = super().forward(src_tokens, src_lengths, return_all_hiddens=return_all_hiddens)
-        x, x_lengths = out["encoder_out"][0], out["src_lengths"][0]
+        if self.out_chunk_end is None and self.fc_out is None:
+            # no chunk slicing or output projection to perform; return the
+            # parent output as-is rather than rebuilding the dict
+            return out
+        x, x_lengths = self._postprocess(
+            out["encoder_out"][0], out["src_lengths"][0]
+        )
 
+        # update the parent's output dict in place instead of allocating a new
+        # dict and singleton lists on every call; nothing downstream holds on
+        # to an encoder output across steps
+        out["encoder_out"][0] = x  # T x B x C (W x B x C after slicing)
+        out["src_lengths"][0] = x_lengths  # B
+        return out
+
+    def _postprocess(self, x, x_lengths):
         # determine which output frame to select for loss evaluation/test, assuming
         # all examples in a batch are of the same length for chunk-wise training/test
         if (
@@ -314,18 +344,7 @@ class SpeechChunkTransformerEncoder(SpeechTransformerEncoder):
         if self.fc_out is not None:
             x = self.fc_out(x)  # T x B x C -> T x B x V
 
-        # The Pytorch Mobile lite interpreter does not supports returning NamedTuple in
-        # `foward` so we use a dictionary instead.
-        # TorchScript does not support mixed values so the values are all lists.
-        # The empty list is equivalent to None.
-        return {
-            "encoder_out": [x],  # T x B x C
-            "encoder_padding_mask": [out["encoder_padding_mask"][0].transpose(0, 1)],  # T x B
-            "encoder_embedding": out["encoder_embedding"],  # None
-            "encoder_states": out["encoder_states"],  # List[T x B x C]
-            "src_tokens": out["src_tokens"],  # None
-            "src_lengths": [x_lengths],  # B
-        }
+        return x, x_lengths
 
     @torch.jit.export
     def reorder_encoder_out(self, encoder_out: Dict[str, List[Tensor]], new_order):
@@ -347,7 +366,7 @@ class SpeechChunkTransformerEncoder(SpeechTransformerEncoder):
             new_encoder_padding_mask = []
         else:
             new_encoder_padding_mask = [
-                encoder_out["encoder_padding_mask"][0].index_select(1, new_order)  # note: transposed
+                encoder_out["encoder_padding_mask"][0].index_select(0, new_order)
             ]
         if len(encoder_out["encoder_embedding"]) == 0:
             new_encoder_embedding = []
@@ -366,9 +385,13 @@ class SpeechChunkTransformerEncoder(SpeechTransformerEncoder):
             new_src_lengths = [(encoder_out["src_lengths"][0]).index_select(0, new_order)]
 
         encoder_states = encoder_out["encoder_states"]
-        if len(encoder_states) > 0:
-            for idx, state in enumerate(encoder_states):
-                encoder_states[idx] = state.index_select(1, new_order)
+        if len(encoder_states) > 1:
+            # reorder all layers' states with a single index_select on the
+            # stacked tensor instead of one kernel launch per layer
+            stacked = torch.stack(encoder_states).index_select(2, new_order)
+            encoder_states = list(stacked.unbind(0))
+        elif len(encoder_states) == 1:
+            encoder_states[0] = encoder_states[0].index_select(1, new_order)
 
         return {
             "encoder_out": new_encoder_out,  # T x B x C
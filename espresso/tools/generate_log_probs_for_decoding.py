@@ -56,7 +56,7 @@ class GenerateLogProbsForDecoding(nn.Module):
         logits = encoder_outs[0]["encoder_out"][0].transpose(0, 1).float()  # T x B x V -> B x T x V
         assert logits.size(0) == bsz
         padding_mask = (
-            encoder_outs[0]["encoder_padding_mask"][0].t()
+            encoder_outs[0]["encoder_padding_mask"][0]  # B x T
             if len(encoder_outs[0]["encoder_padding_mask"]) > 0
             else None
         )
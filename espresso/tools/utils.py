@@ -3,10 +3,12 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import ast
 import os
 import re
 import numpy as np
 from collections import Counter
+from functools import lru_cache
 
 import torch
 
@@ -95,11 +97,18 @@ def convert_padding_direction(
     return src_frames.gather(1, index)
 
 
+@lru_cache(maxsize=None)
+def _parse_nested_str(x):
+    return ast.literal_eval(x)
+
+
 def eval_str_nested_list_or_tuple(x, type=int):
     if x is None:
         return None
     if isinstance(x, str):
-        x = eval(x)
+        # literal_eval only accepts literals (unlike eval), and parses are
+        # cached since the same config strings are evaluated repeatedly
+        x = _parse_nested_str(x)
     if isinstance(x, list):
         return list(
             map(lambda s: eval_str_nested_list_or_tuple(s, type), x))
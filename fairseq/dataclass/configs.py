@@ -361,6 +361,8 @@ class DistributedTrainingConfig(FairseqDataclass):
     )
     fp16: bool = II("common.fp16")
     memory_efficient_fp16: bool = II("common.memory_efficient_fp16")
+    bf16: bool = II("common.bf16")
+    memory_efficient_bf16: bool = II("common.memory_efficient_bf16")
     tpu: bool = II("common.tpu")
     # configuration for --ddp-backend=fully_sharded
     no_reshard_after_forward: bool = field(
@@ -372,6 +374,15 @@ class DistributedTrainingConfig(FairseqDataclass):
     cpu_offload: bool = field(
         default=False, metadata={"help": "offload FP32 params to CPU"}
     )
+    fsdp_sync_every_microbatch: bool = field(
+        default=True,
+        metadata={
+            "help": "with --ddp-backend=fully_sharded and --update-freq > 1, "
+            "reduce-scatter gradients after every micro-batch instead of "
+            "accumulating full-size unsharded gradients under no_sync; "
+            "costs extra communication but uses far less memory"
+        },
+    )
 
 
 @dataclass
@@ -4,6 +4,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import contextlib
+import inspect
 from typing import Optional
 
 import torch
@@ -87,6 +88,8 @@ def fsdp_enable_wrap(cfg: DistributedTrainingConfig, use_sharded_state: bool = F
         )
     if cfg.memory_efficient_fp16:
         assert cfg.fp16  # memory_efficient_fp16 should imply fp16
+    if cfg.memory_efficient_bf16:
+        assert cfg.bf16  # memory_efficient_bf16 should imply bf16
     group = dist_utils.get_data_parallel_group()
     if group is None and cfg.distributed_world_size == 1:
         from fairscale.utils.testing import DummyProcessGroup
@@ -94,13 +97,29 @@ def fsdp_enable_wrap(cfg: DistributedTrainingConfig, use_sharded_state: bool = F
     fsdp_config = {
         "process_group": group,
         "reshard_after_forward": not cfg.no_reshard_after_forward,
-        "mixed_precision": cfg.fp16 and not cfg.memory_efficient_fp16,
+        # keep FP32 copies of the params and run forward/backward (and hence
+        # all-gather/reduce-scatter) in the reduced-precision compute_dtype
+        "mixed_precision": (
+            (cfg.fp16 and not cfg.memory_efficient_fp16)
+            or (cfg.bf16 and not cfg.memory_efficient_bf16)
+        ),
         "fp32_reduce_scatter": cfg.fp32_reduce_scatter,
         "flatten_parameters": True,
         "cpu_offload": cfg.cpu_offload,
-        "compute_dtype": torch.float16 if cfg.fp16 else torch.float32,
+        "compute_dtype": (
+            torch.bfloat16 if cfg.bf16
+            else torch.float16 if cfg.fp16
+            else torch.float32
+        ),
         "bucket_cap_mb": cfg.bucket_cap_mb,
     }
+    # prefetching knobs only exist in newer FSDP implementations; enable them
+    # when available so the next layer's parameter all-gather overlaps with
+    # the current layer's compute instead of serializing after it
+    supported_params = inspect.signature(FSDP.__init__).parameters
+    for key in ("forward_prefetch", "limit_all_gathers"):
+        if key in supported_params:
+            fsdp_config[key] = True
     with enable_wrap(
         wrapper_cls=FullyShardedDataParallel,
         use_sharded_state=use_sharded_state,
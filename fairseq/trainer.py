@@ -64,11 +64,6 @@ class Trainer(object):
             self.device = torch.device("cpu")
 
         if self.cfg.distributed_training.ddp_backend == "fully_sharded":
-            if self.cfg.common.bf16:
-                raise ValueError(
-                    "FullyShardedDataParallel is not compatible with --bf16 or "
-                    "--memory-efficient-bf16"
-                )
             if self.cfg.distributed_training.zero_sharding != "none":
                 raise ValueError(
                     "FullyShardedDataParallel is not compatible with --zero-sharding "
@@ -636,6 +631,13 @@ class Trainer(object):
                     self.data_parallel_world_size > 1
                     and hasattr(self.model, "no_sync")
                     and i < len(samples) - 1
+                    # with FSDP, no_sync accumulates full-size unsharded
+                    # gradients on every GPU, so by default we pay the extra
+                    # reduce-scatter per micro-batch to keep grads sharded
+                    and not (
+                        self.cfg.distributed_training.ddp_backend == "fully_sharded"
+                        and self.cfg.distributed_training.fsdp_sync_every_microbatch
+                    )
                 ):
                     return self.model.no_sync()
                 else: